@@ -3,11 +3,59 @@ Tic Tac Toe Player
 """
 
 import math
+import os
+
+# Opt-in numba kernel (tictactoe_kernel.py), enabled with TICTACTOE_NUMBA=1.
+# It compiles on import (~1.5s), more than the Python search below spends
+# in a whole session, so it is off by default and loaded lazily.
+USE_KERNEL = os.environ.get("TICTACTOE_NUMBA") == "1"
+_kernel = None
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# Transposition table flags: whether a stored value is exact
+# or only a lower/upper bound left behind by an alpha-beta cutoff
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Maps canonical bitboard key (see _canonical_key) -> (value, flag, depth)
+_transpositions = {}
+
+# Bitboard layout: cell (i, j) is bit 3 * i + j of a 9-bit int
+FULL = 0o777
+WINS = (0o007, 0o070, 0o700,  # rows
+        0o111, 0o222, 0o444,  # columns
+        0o421, 0o124)         # diagonals
+
+# The 8 symmetries of the board (4 rotations, then the same 4 mirrored)
+# as permutations: cell k moves to cell SYMMETRIES[s][k]
+SYMMETRIES = ((0, 1, 2, 3, 4, 5, 6, 7, 8),
+              (2, 5, 8, 1, 4, 7, 0, 3, 6),
+              (8, 7, 6, 5, 4, 3, 2, 1, 0),
+              (6, 3, 0, 7, 4, 1, 8, 5, 2),
+              (2, 1, 0, 5, 4, 3, 8, 7, 6),
+              (8, 5, 2, 7, 4, 1, 6, 3, 0),
+              (6, 7, 8, 3, 4, 5, 0, 1, 2),
+              (0, 3, 6, 1, 4, 7, 2, 5, 8))
+
+# For each symmetry, the image of every 9-bit mask under it
+SYMMETRY_TABLES = tuple(
+    tuple(sum(1 << perm[k] for k in range(9) if mask >> k & 1)
+          for mask in range(FULL + 1))
+    for perm in SYMMETRIES
+)
+
+# The same winning lines as (i, j) cells of a list-of-lists board
+LINES = (((0, 0), (0, 1), (0, 2)),
+         ((1, 0), (1, 1), (1, 2)),
+         ((2, 0), (2, 1), (2, 2)),
+         ((0, 0), (1, 0), (2, 0)),
+         ((0, 1), (1, 1), (2, 1)),
+         ((0, 2), (1, 2), (2, 2)),
+         ((0, 0), (1, 1), (2, 2)),
+         ((0, 2), (1, 1), (2, 0)))
+
 
 def initial_state():
     """
@@ -65,55 +113,30 @@ def winner(board):
     """
     Returns the winner of the game, if there is one.
     """
-    horizontally = set()
-    vertically = []
-    diagonally = [set(), set()]
-
-    for i in range(len(board)):
-        row = board[i]
-
-        # check if horizontally has a winner
-        horizontally.update(row)
-        if len(horizontally) == 1 and EMPTY not in horizontally:
-            return horizontally.pop()
-        horizontally.clear()
-
-        # maintain vertically status
-        if len(vertically) == 0:
-            vertically = [set((piece,)) for piece in row]
-        else:
-            for j in range(len(row)):
-                vertically[j].add(row[j])
-
-        ## maintain diagonally status
-        # main diagonal
-        check_diagonal_0 = diagonally[0]
-        check_diagonal_0.add(row[i])
-
-        # anti-diagonal
-        check_diagonal_1 = diagonally[1]
-        check_diagonal_1.add(row[len(row)-1-i])
-
-    # Check if vertically has a winner
-    for col in vertically:
-        if len(col) == 1 and EMPTY not in col:
-            return col.pop()
-
-    # Check if diagonally has a winner
-    for diagonal in diagonally:
-        if len(diagonal) == 1 and EMPTY not in diagonal:
-            return diagonal.pop()
-
-    return None
+    return _status(board)[0]
 
 
 def terminal(board):
     """
     Returns True if game is over, False otherwise.
     """
-    if winner(board) is None:
-        return False if actions(board) else True
-    return True
+    winner_player, has_empty = _status(board)
+    return winner_player is not None or not has_empty
+
+
+def _status(board):
+    """
+    Returns (winner, has_empty) for the board in a single pass
+    over its winning lines, stopping at the first complete one.
+    """
+    has_empty = False
+    for a, b, c in LINES:
+        line = (board[a[0]][a[1]], board[b[0]][b[1]], board[c[0]][c[1]])
+        if EMPTY in line:
+            has_empty = True
+        elif line[0] == line[1] == line[2]:
+            return line[0], has_empty
+    return None, has_empty
 
 
 def utility(board):
@@ -134,28 +157,191 @@ def minimax(board):
     """
     if terminal(board):
         return None
-    
-    if player(board) == X:
-        return max(actions(board), key=lambda action: min_value(result(board, action)))
-    return min(actions(board), key=lambda action: max_value(result(board, action)))
-
 
-def min_value(board):
+    x_bits, o_bits = _to_bits(board)
+    maximizing = _player_bits(x_bits, o_bits) == X
+    kernel = _load_kernel() if USE_KERNEL else None
+    if kernel is not None:
+        return divmod(kernel.best_action_bits(x_bits, o_bits, maximizing), 3)
+
+    ordered_actions = list(_iter_actions(x_bits, o_bits))
+
+    # Iterative deepening: the scores of each depth order the actions
+    # for the next one, so the best move so far is searched first
+    for depth in range(1, len(ordered_actions) + 1):
+        alpha, beta = -math.inf, math.inf
+        scores = {}
+        for k in ordered_actions:
+            if maximizing:
+                v = min_value(x_bits | 1 << k, o_bits, alpha, beta, depth - 1)
+                alpha = max(alpha, v)
+            else:
+                v = max_value(x_bits, o_bits | 1 << k, alpha, beta, depth - 1)
+                beta = min(beta, v)
+            scores[k] = v
+        ordered_actions.sort(key=scores.get, reverse=maximizing)
+    return divmod(ordered_actions[0], 3)
+
+
+def min_value(x_bits, o_bits, alpha, beta, depth):
+    # Searching past the last empty cell finds nothing new
+    depth = min(depth, 9 - (x_bits | o_bits).bit_count())
+    key = _canonical_key(x_bits, o_bits)
+    cached = _probe(key, alpha, beta, depth)
+    if cached is not None:
+        return cached
+
+    alpha_orig, beta_orig = alpha, beta
     v = math.inf
-    if terminal(board):
-        return utility(board)
-
-    for action in actions(board):
-        v = min(v, max_value(result(board, action)))
+    if _terminal_bits(x_bits, o_bits):
+        v = _utility_bits(x_bits, o_bits)
+    elif depth == 0:
+        v = 0
+    else:
+        for k in _iter_actions(x_bits, o_bits):
+            v = min(v, max_value(x_bits, o_bits | 1 << k, alpha, beta, depth - 1))
+            if v <= alpha:
+                break
+            beta = min(beta, v)
+
+    _store(key, v, alpha_orig, beta_orig, depth)
     return v
 
 
-def max_value(board):
-    v = -math.inf
-    if terminal(board):
-        return utility(board)
+def max_value(x_bits, o_bits, alpha, beta, depth):
+    # Searching past the last empty cell finds nothing new
+    depth = min(depth, 9 - (x_bits | o_bits).bit_count())
+    key = _canonical_key(x_bits, o_bits)
+    cached = _probe(key, alpha, beta, depth)
+    if cached is not None:
+        return cached
 
-    for action in actions(board):
-        v = max(v, min_value(result(board, action)))
+    alpha_orig, beta_orig = alpha, beta
+    v = -math.inf
+    if _terminal_bits(x_bits, o_bits):
+        v = _utility_bits(x_bits, o_bits)
+    elif depth == 0:
+        v = 0
+    else:
+        for k in _iter_actions(x_bits, o_bits):
+            v = max(v, min_value(x_bits | 1 << k, o_bits, alpha, beta, depth - 1))
+            if v >= beta:
+                break
+            alpha = max(alpha, v)
+
+    _store(key, v, alpha_orig, beta_orig, depth)
     return v
 
+
+def _load_kernel():
+    """
+    Imports the numba kernel on first use. Returns None, and turns
+    USE_KERNEL off, if numba is missing or fails to compile it.
+    """
+    global USE_KERNEL, _kernel
+    if _kernel is None:
+        try:
+            from numba.core.errors import NumbaError
+        except ImportError:
+            USE_KERNEL = False
+            return None
+
+        try:
+            import tictactoe_kernel
+        except NumbaError:
+            USE_KERNEL = False
+            return None
+        _kernel = tictactoe_kernel
+    return _kernel
+
+
+def _to_bits(board):
+    """
+    Returns the board as a pair of 9-bit ints (x_bits, o_bits).
+    """
+    x_bits, o_bits = 0, 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == X:
+                x_bits |= 1 << (3 * i + j)
+            elif board[i][j] == O:
+                o_bits |= 1 << (3 * i + j)
+    return x_bits, o_bits
+
+
+def _canonical_key(x_bits, o_bits):
+    """
+    Returns the same key x_bits << 9 | o_bits for every board
+    that is a rotation or reflection of this one.
+    """
+    return min(table[x_bits] << 9 | table[o_bits] for table in SYMMETRY_TABLES)
+
+
+def _player_bits(x_bits, o_bits):
+    return X if x_bits.bit_count() == o_bits.bit_count() else O
+
+
+def _iter_actions(x_bits, o_bits):
+    free = ~(x_bits | o_bits) & FULL
+    while free:
+        lowest = free & -free
+        yield lowest.bit_length() - 1
+        free ^= lowest
+
+
+def _winner_bits(x_bits, o_bits):
+    for mask in WINS:
+        if x_bits & mask == mask:
+            return X
+        if o_bits & mask == mask:
+            return O
+    return None
+
+
+def _terminal_bits(x_bits, o_bits):
+    return _winner_bits(x_bits, o_bits) is not None or x_bits | o_bits == FULL
+
+
+def _utility_bits(x_bits, o_bits):
+    winner_player = _winner_bits(x_bits, o_bits)
+    if winner_player == X:
+        return 1
+    elif winner_player == O:
+        return -1
+    return 0
+
+
+def _probe(key, alpha, beta, depth):
+    """
+    Returns the cached value of a board if it was searched at least
+    `depth` moves deep and settles the search within the (alpha, beta)
+    window, None otherwise.
+    """
+    entry = _transpositions.get(key)
+    if entry is None:
+        return None
+
+    value, flag, searched_depth = entry
+    if searched_depth < depth:
+        return None
+    if flag == EXACT:
+        return value
+    if flag == LOWER and value >= beta:
+        return value
+    if flag == UPPER and value <= alpha:
+        return value
+    return None
+
+
+def _store(key, value, alpha, beta, depth):
+    """
+    Caches the value of a board searched `depth` moves deep
+    with the (alpha, beta) window.
+    """
+    if value <= alpha:
+        flag = UPPER
+    elif value >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    _transpositions[key] = (value, flag, depth)
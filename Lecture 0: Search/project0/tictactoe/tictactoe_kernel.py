@@ -0,0 +1,71 @@
+"""
+Compiled minimax kernel for Tic Tac Toe bitboards
+"""
+
+import numpy as np
+from numba import njit
+
+# Same layout as tictactoe.py: cell (i, j) is bit 3 * i + j of a 9-bit int
+FULL = 0o777
+WINS = np.array([0o007, 0o070, 0o700,  # rows
+                 0o111, 0o222, 0o444,  # columns
+                 0o421, 0o124],        # diagonals
+                dtype=np.int64)
+
+
+@njit("int64(int64, int64, int64, int64, boolean)")
+def minimax_bits(x, o, alpha, beta, maximizing):
+    """
+    Returns the minimax value (1, 0 or -1) of the bitboard (x, o),
+    searched with alpha-beta pruning inside the (alpha, beta) window.
+    """
+    for mask in WINS:
+        if x & mask == mask:
+            return 1
+        if o & mask == mask:
+            return -1
+
+    free = ~(x | o) & FULL
+    if free == 0:
+        return 0
+
+    if maximizing:
+        v = -2
+        for k in range(9):
+            if free >> k & 1:
+                v = max(v, minimax_bits(x | 1 << k, o, alpha, beta, False))
+                if v >= beta:
+                    return v
+                alpha = max(alpha, v)
+        return v
+
+    v = 2
+    for k in range(9):
+        if free >> k & 1:
+            v = min(v, minimax_bits(x, o | 1 << k, alpha, beta, True))
+            if v <= alpha:
+                return v
+            beta = min(beta, v)
+    return v
+
+
+@njit("int64(int64, int64, boolean)")
+def best_action_bits(x, o, maximizing):
+    """
+    Returns the bit index of the optimal move on a non-terminal bitboard.
+    """
+    alpha, beta = -2, 2
+    best_action = -1
+    free = ~(x | o) & FULL
+
+    for k in range(9):
+        if free >> k & 1:
+            if maximizing:
+                v = minimax_bits(x | 1 << k, o, alpha, beta, False)
+                if v > alpha:
+                    alpha, best_action = v, k
+            else:
+                v = minimax_bits(x, o | 1 << k, alpha, beta, True)
+                if v < beta:
+                    beta, best_action = v, k
+    return best_action
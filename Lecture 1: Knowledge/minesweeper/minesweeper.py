@@ -1,6 +1,8 @@
 import itertools
 import random
 
+import numpy as np
+
 
 class Minesweeper():
     """
@@ -15,20 +17,13 @@ class Minesweeper():
         self.mines = set()
 
         # Initialize an empty field with no mines
-        self.board = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                row.append(False)
-            self.board.append(row)
+        self.board = np.zeros((height, width), dtype=bool)
 
         # Add mines randomly
-        while len(self.mines) != mines:
-            i = random.randrange(height)
-            j = random.randrange(width)
-            if not self.board[i][j]:
-                self.mines.add((i, j))
-                self.board[i][j] = True
+        for k in random.sample(range(height * width), mines):
+            i, j = divmod(k, width)
+            self.mines.add((i, j))
+            self.board[i, j] = True
 
         # At first, player has found no mines
         self.mines_found = set()
@@ -50,7 +45,7 @@ class Minesweeper():
 
     def is_mine(self, cell):
         i, j = cell
-        return self.board[i][j]
+        return bool(self.board[i, j])
 
     def nearby_mines(self, cell):
         """
@@ -59,23 +54,12 @@ class Minesweeper():
         not including the cell itself.
         """
 
-        # Keep count of nearby mines
-        count = 0
-
-        # Loop over all cells within one row and column
-        for i in range(cell[0] - 1, cell[0] + 2):
-            for j in range(cell[1] - 1, cell[1] + 2):
-
-                # Ignore the cell itself
-                if (i, j) == cell:
-                    continue
-
-                # Update count if cell in bounds and is mine
-                if 0 <= i < self.height and 0 <= j < self.width:
-                    if self.board[i][j]:
-                        count += 1
+        i, j = cell
 
-        return count
+        # Sum the in-bounds block around the cell, minus the cell itself
+        rows = slice(max(0, i - 1), min(self.height, i + 2))
+        cols = slice(max(0, j - 1), min(self.width, j + 2))
+        return int(self.board[rows, cols].sum()) - int(self.board[i, j])
 
     def won(self):
         """
@@ -87,52 +71,69 @@ class Minesweeper():
 class Sentence():
     """
     Logical statement about a Minesweeper game
-    A sentence consists of a set of board cells,
-    and a count of the number of those cells which are mines.
+    A sentence consists of a bitmask of board cells, one bit per cell
+    (see MinesweeperAI.to_bit), and a count of the number of those
+    cells which are mines.
     """
 
     def __init__(self, cells, count):
-        self.cells = set(cells)
+        self.cells = cells
         self.count = count
 
     def __eq__(self, other):
         return self.cells == other.cells and self.count == other.count
 
+    def __hash__(self):
+        return hash((self.cells, self.count))
+
     def __str__(self):
-        return f"{self.cells} = {self.count}"
+        # Without the board width only the bit indices of the cells are
+        # known; index k is the cell divmod(k, width)
+        indices = [bit.bit_length() - 1 for bit in iter_bits(self.cells)]
+        return f"{indices} = {self.count}"
 
     def known_mines(self):
         """
-        Returns the set of all cells in self.cells known to be mines.
+        Returns the bitmask of all cells in self.cells known to be mines.
         """
-        if len(self.cells) == self.count:
-            return self.cells.copy()
-        return set()
+        if self.cells.bit_count() == self.count:
+            return self.cells
+        return 0
 
     def known_safes(self):
         """
-        Returns the set of all cells in self.cells known to be safe.
+        Returns the bitmask of all cells in self.cells known to be safe.
         """
         if self.count == 0:
-            return self.cells.copy()
-        return set()
+            return self.cells
+        return 0
 
-    def mark_mine(self, cell):
+    def mark_mine(self, cell_bit):
         """
         Updates internal knowledge representation given the fact that
-        a cell is known to be a mine.
+        the cell with single-bit mask `cell_bit` is known to be a mine.
         """
-        if cell in self.cells:
-            self.cells.remove(cell)
+        if self.cells & cell_bit:
+            self.cells &= ~cell_bit
             self.count -= 1
 
-    def mark_safe(self, cell):
+    def mark_safe(self, cell_bit):
         """
         Updates internal knowledge representation given the fact that
-        a cell is known to be safe.
+        the cell with single-bit mask `cell_bit` is known to be safe.
         """
-        if cell in self.cells:
-            self.cells.remove(cell)
+        if self.cells & cell_bit:
+            self.cells &= ~cell_bit
+
+
+def iter_bits(bits):
+    """
+    Yields each set bit of a bitmask as a single-bit int.
+    """
+    while bits:
+        lowest = bits & -bits
+        yield lowest
+        bits ^= lowest
 
 
 class MinesweeperAI():
@@ -149,30 +150,72 @@ class MinesweeperAI():
         # Keep track of which cells have been clicked on
         self.moves_made = set()
 
-        # Keep track of cells known to be safe or mines
+        # Keep track of cells known to be safe or mines,
+        # both as sets of cells and as bitmasks
         self.mines = set()
         self.safes = set()
+        self.mine_bits = 0
+        self.safe_bits = 0
 
-        # List of sentences about the game known to be true
+        # List of sentences about the game known to be true,
+        # and the same sentences as a set for fast membership tests
         self.knowledge = []
+        self.knowledge_set = set()
+
+        # Bitmask of the neighboring cells of every cell, which never change
+        self.neighbors = {
+            (i, j): sum(
+                self.to_bit((ni, nj))
+                for ni in range(max(0, i - 1), min(height, i + 2))
+                for nj in range(max(0, j - 1), min(width, j + 2))
+                if (ni, nj) != (i, j)
+            )
+            for i in range(height)
+            for j in range(width)
+        }
+
+    def to_bit(self, cell):
+        """
+        Returns the single-bit mask of a cell.
+        """
+        i, j = cell
+        return 1 << (i * self.width + j)
+
+    def to_cell(self, cell_bit):
+        """
+        Returns the cell of a single-bit mask.
+        """
+        return divmod(cell_bit.bit_length() - 1, self.width)
 
     def mark_mine(self, cell):
         """
         Marks a cell as a mine, and updates all knowledge
         to mark that cell as a mine as well.
         """
+        cell_bit = self.to_bit(cell)
         self.mines.add(cell)
+        self.mine_bits |= cell_bit
         for sentence in self.knowledge:
-            sentence.mark_mine(cell)
+            if sentence.cells & cell_bit:
+                # Rehash the sentence under its new cells and count
+                self.knowledge_set.discard(sentence)
+                sentence.mark_mine(cell_bit)
+                self.knowledge_set.add(sentence)
 
     def mark_safe(self, cell):
         """
         Marks a cell as safe, and updates all knowledge
         to mark that cell as safe as well.
         """
+        cell_bit = self.to_bit(cell)
         self.safes.add(cell)
+        self.safe_bits |= cell_bit
         for sentence in self.knowledge:
-            sentence.mark_safe(cell)
+            if sentence.cells & cell_bit:
+                # Rehash the sentence under its new cells
+                self.knowledge_set.discard(sentence)
+                sentence.mark_safe(cell_bit)
+                self.knowledge_set.add(sentence)
 
     def add_knowledge(self, cell, count):
         """
@@ -196,54 +239,42 @@ class MinesweeperAI():
 
         # 3) add a new sentence to the AI's knowledge base
         # based on the value of `cell` and `count`
-        def get_neighbors(cell):
-            neighbors = set()
-            for i in range(cell[0] - 1, cell[0] + 2):
-                for j in range(cell[1] - 1, cell[1] + 2):
-                    if (i, j) == cell:
-                        continue
-                    if 0 <= i < self.height and 0 <= j < self.width:
-                        neighbors.add((i, j))
-            return neighbors
-
-        neighbors = get_neighbors(cell)
-        neighbors_known_to_be_mines = neighbors.intersection(self.mines)
-        neighbors_known_to_be_safes = neighbors.intersection(self.safes) 
-        neighbors_known = neighbors_known_to_be_mines.union(neighbors_known_to_be_safes)
-        neighbors_not_known = neighbors.difference(neighbors_known)
-        if not len(neighbors_not_known):
+        neighbors = self.neighbors[cell]
+        neighbors_known_to_be_mines = neighbors & self.mine_bits
+        neighbors_not_known = neighbors & ~(self.mine_bits | self.safe_bits)
+        if not neighbors_not_known:
             return
 
-        neighbors_mines_count = count - len(neighbors_known_to_be_mines)
+        neighbors_mines_count = count - neighbors_known_to_be_mines.bit_count()
         new_sentence = Sentence(neighbors_not_known, neighbors_mines_count)
-        if new_sentence in self.knowledge:
+        if new_sentence in self.knowledge_set:
             return
         self.knowledge.append(new_sentence)
+        self.knowledge_set.add(new_sentence)
 
         # 4) mark any additional cells as safe or as mines
         # if it can be concluded based on the AI's knowledge base
         # 5) add any new sentences to the AI's knowledge base
         # if they can be inferred from existing knowledge
         def make_conclusion(sentence):
-            if sentence.count == 0:
-                for cell in sentence.cells.copy():
-                    self.mark_safe(cell)
-            elif len(sentence.cells) == sentence.count:
-                for cell in sentence.cells.copy():
-                    self.mark_mine(cell)
-                
+            for cell_bit in iter_bits(sentence.known_safes()):
+                self.mark_safe(self.to_cell(cell_bit))
+            for cell_bit in iter_bits(sentence.known_mines()):
+                self.mark_mine(self.to_cell(cell_bit))
+
         def make_inference(set1, set2):
-            if set1 is set2:
+            # Sentences over the same cells have nothing to infer
+            if set1.cells == set2.cells:
                 return None
 
-            if len(set1.cells) > len(set2.cells):
+            if set1.cells.bit_count() > set2.cells.bit_count():
                 set1, set2 = set2, set1
-            
-            if set1.cells.issubset(set2.cells):
-                new_cells = set2.cells.difference(set1.cells)
+
+            if set1.cells & set2.cells == set1.cells:
+                new_cells = set2.cells & ~set1.cells
                 new_count = set2.count - set1.count
                 new_sentence = Sentence(new_cells, new_count)
-                if new_sentence not in self.knowledge:
+                if new_sentence not in self.knowledge_set:
                     return new_sentence
             return None
 
@@ -258,16 +289,22 @@ class MinesweeperAI():
             for sentence in self.knowledge:
                 make_conclusion(sentence)
 
-            # Step 2: Remove empty sentences
-            self.knowledge = [s for s in self.knowledge if len(s.cells)]
+            # Step 2: Remove empty sentences, and duplicates left behind
+            # by marking cells
+            self.knowledge = list(dict.fromkeys(s for s in self.knowledge if s.cells))
+            self.knowledge_set = set(self.knowledge)
 
-            # Step 3: Infer new sentences from subset relationships
+            # Step 3: Infer new sentences from subset relationships,
+            # only pairing up sentences that share at least one cell
             new_sentences = []
-            for set1 in self.knowledge:
-                for set2 in self.knowledge:
+            for i, set1 in enumerate(self.knowledge):
+                for set2 in self.knowledge[i + 1:]:
+                    if not set1.cells & set2.cells:
+                        continue
                     new_sentence = make_inference(set1, set2)
                     if new_sentence:
                         new_sentences.append(new_sentence)
+                        self.knowledge_set.add(new_sentence)
 
             self.knowledge.extend(new_sentences)
 
@@ -296,6 +333,19 @@ class MinesweeperAI():
             1) have not already been chosen, and
             2) are not known to be mines
         """
-        choices = set(itertools.product(range(self.height), range(self.width)))
-        choices.difference_update(self.moves_made, self.mines)
-        return random.choice(list(choices)) if len(choices) else None
+        blocked = self.moves_made | self.mines
+        total = self.height * self.width
+        if len(blocked) >= total:
+            return None
+
+        # Mostly blocked board: guessing would miss too often,
+        # so pick from the remaining cells directly
+        if len(blocked) > total * 0.8:
+            choices = set(itertools.product(range(self.height), range(self.width)))
+            choices.difference_update(blocked)
+            return random.choice(list(choices))
+
+        while True:
+            cell = (random.randrange(self.height), random.randrange(self.width))
+            if cell not in blocked:
+                return cell